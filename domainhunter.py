@@ -8,6 +8,15 @@ Dependencies:
 - pst-utils package
 - libpst-utils package
 - python-magic (optional, for file type verification)
+- google-re2 (optional, for single-pass keyword prefiltering)
+- orjson (optional, for faster JSON reading and writing)
+- pyahocorasick (optional, for single-pass literal keyword matching)
+
+Output (in the output directory, pst_output by default):
+- sensitive_matches.jsonl: one JSON object per email with sensitive content,
+  written as the scan runs (replaces the former sensitive_matches.json)
+- sensitive_matches_summary.json: total match count and per-category counts
+- mbox/: the mbox files extracted by readpst
 """
 
 import subprocess
@@ -15,17 +24,49 @@ import re
 import sys
 import os
 import logging
+import mmap
 from datetime import datetime
-from typing import List, Set, Dict, Optional, Tuple
-from dataclasses import dataclass
+from typing import BinaryIO, ContextManager, Deque, Iterator, List, Set, Dict, Optional, Tuple
+from dataclasses import asdict, dataclass
 import multiprocessing as mp
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 import json
+from itertools import islice
+from collections import deque
 try:
     import magic
     MAGIC_AVAILABLE = True
 except ImportError:
     MAGIC_AVAILABLE = False
+try:
+    import re2
+    RE2_AVAILABLE = hasattr(re2, "Set")
+except ImportError:
+    RE2_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, converting sets to lists."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=list, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, default=list, indent=2 if indent else None).encode('utf-8')
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 @dataclass
 class SensitiveMatch:
@@ -103,42 +144,219 @@ class KeywordManager:
         if custom_keywords_file:
             self._load_custom_keywords(custom_keywords_file)
 
-        self.compiled_patterns = self._compile_patterns()
+        self.literal_keywords, self.pattern_keywords = self._partition_keywords()
+        self.literal_automaton = self._compile_literal_automaton() if self.literal_keywords else None
+        self.compiled_patterns = self._compile_patterns(self.pattern_keywords)
+        # Used for the literals instead of the automaton when lower() changes the text's length
+        self.literal_patterns = self._compile_patterns(self.literal_keywords)
+        self.category_names: List[str] = list(self.compiled_patterns)
+        self.category_set = self._compile_category_set() if RE2_AVAILABLE else None
 
     def _load_custom_keywords(self, filepath: str) -> None:
         """Load custom keywords from a JSON file."""
         try:
-            with open(filepath, 'r') as f:
-                custom_categories = json.load(f)
+            with open(filepath, 'rb') as f:
+                custom_categories = _json_loads(f.read())
                 for category, keywords in custom_categories.items():
-                    if category in self.keyword_categories:
-                        self.keyword_categories[category].extend(keywords)
-                    else:
-                        self.keyword_categories[category] = keywords
+                    # Drop blank and duplicate keywords so each alternative is compiled once
+                    merged = self.keyword_categories.get(category, []) + [
+                        keyword.strip() for keyword in keywords if keyword.strip()
+                    ]
+                    self.keyword_categories[category] = list(dict.fromkeys(merged))
         except Exception as e:
             logging.error(f"Error loading custom keywords: {e}")
 
-    def _compile_patterns(self) -> Dict[str, List[re.Pattern]]:
-        """Compile regex patterns for all keywords."""
-        compiled = {}
+    def _partition_keywords(self) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """Split keywords into plain literals for Aho-Corasick and regex fragments for re."""
+        literal_keywords: Dict[str, List[str]] = {}
+        pattern_keywords: Dict[str, List[str]] = {}
         for category, keywords in self.keyword_categories.items():
-            compiled[category] = [
-                re.compile(rf"\b{keyword}\b", re.IGNORECASE)
-                for keyword in keywords
-            ]
+            for keyword in keywords:
+                is_literal = AHOCORASICK_AVAILABLE and re.escape(keyword) == keyword
+                target = literal_keywords if is_literal else pattern_keywords
+                target.setdefault(category, []).append(keyword)
+
+        # re tries alternatives left to right, so put longer keywords first
+        for keywords in pattern_keywords.values():
+            keywords.sort(key=len, reverse=True)
+        return literal_keywords, pattern_keywords
+
+    def _compile_literal_automaton(self) -> "ahocorasick.Automaton":
+        """Build one Aho-Corasick automaton over the lowercased literal keywords of every category."""
+        categories_by_keyword: Dict[str, List[str]] = {}
+        for category, keywords in self.literal_keywords.items():
+            for keyword in keywords:
+                categories_by_keyword.setdefault(keyword.lower(), []).append(category)
+
+        automaton = ahocorasick.Automaton()
+        for keyword, categories in categories_by_keyword.items():
+            automaton.add_word(keyword, (keyword, categories))
+        automaton.make_automaton()
+        return automaton
+
+    def _compile_patterns(self, keywords_by_category: Dict[str, List[str]]) -> Dict[str, re.Pattern]:
+        """Compile one alternation pattern per category so each is a single pass over the text."""
+        compiled = {}
+        for category, keywords in keywords_by_category.items():
+            compiled[category] = re.compile(
+                r"\b(?:" + "|".join(keywords) + r")\b",
+                re.IGNORECASE
+            )
         return compiled
 
+    def _compile_category_set(self) -> Optional["re2.Set"]:
+        """Compile all category patterns into one RE2 set that reports which categories occur."""
+        try:
+            category_set = re2.Set.SearchSet()
+            for category in self.category_names:
+                # No \b here: RE2's is ASCII-only, and dropping it keeps the prefilter a superset of re
+                category_set.Add(r"(?i)(?:" + "|".join(map(_to_re2_syntax, self.pattern_keywords[category])) + ")")
+            category_set.Compile()
+            return category_set
+        except Exception as e:
+            logging.warning(f"Falling back to re for keyword scanning: {e}")
+            return None
+
+    def find_matches(self, text: str) -> Tuple[Set[str], List[str]]:
+        """Return the matched categories and the matched keyword text found in text."""
+        hits: Dict[str, List[Tuple[int, str]]] = {}
+
+        lowered = text.lower() if self.literal_automaton is not None else None
+        if lowered is not None and len(lowered) == len(text):
+            for end, (keyword, categories) in self.literal_automaton.iter(lowered):
+                start = end - len(keyword) + 1
+                if _is_word_boundary(text, start) and _is_word_boundary(text, end + 1):
+                    for category in categories:
+                        hits.setdefault(category, []).append((start, text[start:end + 1]))
+        else:
+            for category, pattern in self.literal_patterns.items():
+                for m in pattern.finditer(text):
+                    hits.setdefault(category, []).append((m.start(), m.group(0)))
+
+        if self.category_set is not None:
+            # RE2 finds the candidate categories in one pass; re only runs on those.
+            # Set.Match returns None rather than an empty list when nothing matches.
+            categories = [self.category_names[i] for i in sorted(self.category_set.Match(text) or [])]
+        else:
+            categories = self.category_names
+
+        for category in categories:
+            for m in self.compiled_patterns[category].finditer(text):
+                hits.setdefault(category, []).append((m.start(), m.group(0)))
+
+        # Report in category and text order so the context does not depend on which matcher found a hit
+        matched = [category for category in self.keyword_categories if category in hits]
+        context_parts = [" ".join(match for _, match in sorted(hits[category])) for category in matched]
+        return set(matched), context_parts
+
+# RE2's \s, \w and \d are ASCII-only; these members cover everything re's Unicode classes match.
+_RE2_CLASS_ESCAPES = {
+    "s": r"\s\x0b\x1c-\x1f\x85\p{Z}",
+    "w": r"\w\p{L}\p{N}",
+    "d": r"\p{Nd}",
+}
+
+def _to_re2_syntax(pattern: str) -> str:
+    """Rewrite \\s, \\w and \\d in a keyword pattern to RE2 classes that match at least what re matches."""
+    parts = []
+    class_start = None
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escape = pattern[i + 1]
+            if escape in _RE2_CLASS_ESCAPES:
+                members = _RE2_CLASS_ESCAPES[escape]
+                parts.append(members if class_start is not None else f"[{members}]")
+            else:
+                parts.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if char == "[" and class_start is None:
+            class_start = i
+        elif char == "]" and class_start is not None and pattern[class_start + 1:i] not in ("", "^"):
+            class_start = None
+        parts.append(char)
+        i += 1
+    return "".join(parts)
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    """Return True if index in text sits on a regex-style \\b word boundary."""
+    before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == "_")
+    after = index < len(text) and (text[index].isalnum() or text[index] == "_")
+    return before != after
+
+def extract_email_content(email_text: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    """Extract relevant fields from email text."""
+    header, _, body = email_text.partition("\n\n")
+    email_id = subject = timestamp = None
+
+    for line in header.splitlines():
+        name, sep, value = line.partition(":")
+        if not sep:
+            continue
+        name = name.lower()
+        value = value.strip()
+        if name == "message-id" and email_id is None:
+            email_id = value.strip("<>")
+        elif name == "subject" and subject is None:
+            subject = value
+        elif name in ("date", "sent") and timestamp is None:
+            timestamp = value
+
+    return email_id or None, subject, body.strip() or None, timestamp
+
+def scan_email(email_text: str, keyword_manager: KeywordManager) -> Optional[SensitiveMatch]:
+    """Scan a single email for sensitive information."""
+    email_id, subject, body, timestamp = extract_email_content(email_text)
+
+    if not any([subject, body]):
+        return None
+
+    matched_keywords, context_parts = keyword_manager.find_matches(email_text)
+
+    if matched_keywords:
+        return SensitiveMatch(
+            email_id=email_id or "",
+            subject=subject or "",
+            matched_keywords=matched_keywords,
+            context="\n".join(context_parts),
+            timestamp=timestamp or ""
+        )
+
+    return None
+
+# Per-process keyword manager, built once by _init_worker in each pool worker.
+_worker_keyword_manager: Optional[KeywordManager] = None
+
+def _init_worker(custom_keywords_file: Optional[str]) -> None:
+    """Compile the keyword patterns once per worker process."""
+    global _worker_keyword_manager
+    _worker_keyword_manager = KeywordManager(custom_keywords_file)
+
+def _scan_emails_worker(emails: List[str]) -> List[SensitiveMatch]:
+    """Scan a batch of emails using the worker's keyword manager, returning only the matches."""
+    matches = (scan_email(email_text, _worker_keyword_manager) for email_text in emails)
+    return [match for match in matches if match]
+
 class PSTScanner:
     """Main class for scanning PST files for sensitive information."""
 
     def __init__(self,
                  output_dir: str = "pst_output",
                  log_file: str = "pst_scan.log",
-                 custom_keywords_file: Optional[str] = None):
+                 custom_keywords_file: Optional[str] = None,
+                 workers: Optional[int] = None):
         self.output_dir = Path(output_dir)
         self.setup_logging(log_file)
+        self.custom_keywords_file = custom_keywords_file
+        self.workers = workers or mp.cpu_count()
         self.keyword_manager = KeywordManager(custom_keywords_file)
-        self.matches: List[SensitiveMatch] = []
+        self.matches_file = self.output_dir / "sensitive_matches.jsonl"
+        self._out: Optional[BinaryIO] = None
+        self._matches_file_started = False
+        self.match_count = 0
+        self.category_counts: Dict[str, int] = {}
 
     def setup_logging(self, log_file: str) -> None:
         """Configure logging with both file and console handlers."""
@@ -168,49 +386,11 @@ class PSTScanner:
 
     def extract_email_content(self, email_text: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
         """Extract relevant fields from email text."""
-        email_id = re.search(r'(?:Message-ID|Message-Id): <(.+?)>', email_text, re.IGNORECASE)
-        subject = re.search(r'Subject: (.*?)\n', email_text, re.IGNORECASE)
-        timestamp = re.search(r'(?:Date|Sent): (.*?)\n', email_text, re.IGNORECASE)
-
-        body = re.search(r'(?:Content-Type: text/plain|Content-Type: text/html).*?\n\n(.*?)(?=\n\n|$)',
-                        email_text, re.DOTALL | re.IGNORECASE)
-        if not body:
-            body = re.search(r'\n\n(.*?)(?=\n\n|$)', email_text, re.DOTALL)
-
-        return (
-            email_id.group(1) if email_id else None,
-            subject.group(1) if subject else None,
-            body.group(1) if body else None,
-            timestamp.group(1) if timestamp else None
-        )
+        return extract_email_content(email_text)
 
     def scan_email(self, email_text: str) -> Optional[SensitiveMatch]:
         """Scan a single email for sensitive information."""
-        email_id, subject, body, timestamp = self.extract_email_content(email_text)
-
-        if not any([subject, body]):
-            return None
-
-        matched_keywords = set()
-        context = ""
-
-        for category, patterns in self.keyword_manager.compiled_patterns.items():
-            for pattern in patterns:
-                matches = pattern.findall(email_text)
-                if matches:
-                    matched_keywords.add(category)
-                    context += " ".join(matches) + "\n"
-
-        if matched_keywords:
-            return SensitiveMatch(
-                email_id=email_id or "",
-                subject=subject or "",
-                matched_keywords=matched_keywords,
-                context=context.strip(),
-                timestamp=timestamp or ""
-            )
-
-        return None
+        return scan_email(email_text, self.keyword_manager)
 
     def scan_pst_file(self, pst_file: str) -> None:
         """Scan a PST file for sensitive information."""
@@ -218,8 +398,9 @@ class PSTScanner:
             return
 
         try:
-            # Create output directory if it doesn't exist
+            # Create output directory if it doesn't exist and start this run's match file
             self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._open_matches_file()
 
             # Create a subdirectory for the mbox file
             mbox_dir = self.output_dir / "mbox"
@@ -238,9 +419,10 @@ class PSTScanner:
             if not mbox_files:
                 raise FileNotFoundError("No mbox file was generated")
 
-            # Process each mbox file found (usually there's just one)
-            for mbox_file in mbox_files:
-                self.process_mbox_file(mbox_file)
+            # Process each mbox file found (usually there's just one), sharing one worker pool
+            with self._create_pool() as pool:
+                for mbox_file in mbox_files:
+                    self.process_mbox_file(mbox_file, pool)
 
         except subprocess.CalledProcessError as e:
             logging.error(f"Error running readpst: {e.stderr}")
@@ -248,47 +430,105 @@ class PSTScanner:
         except Exception as e:
             logging.error(f"Error scanning PST file {pst_file}: {e}")
             raise
+        finally:
+            # Flush matches found so far, even when the scan fails part-way
+            self._close_matches_file()
+
+    def iter_emails(self, mbox_file: Path) -> Iterator[str]:
+        """Yield each email in an mbox file, splitting on "From " lines of a memory-mapped view."""
+        with open(mbox_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 0
+                while start < len(mm):
+                    end = mm.find(b"\nFrom ", start)
+                    end = len(mm) if end == -1 else end + 1
+                    # Normalise line endings the way text-mode reads did
+                    text = mm[start:end].decode('utf-8', 'ignore')
+                    yield text.replace('\r\n', '\n').replace('\r', '\n')
+                    start = end
+
+    def _create_pool(self) -> ContextManager[Optional[ProcessPoolExecutor]]:
+        """Create the worker pool used for scanning, or a null context when running in-process."""
+        if self.workers <= 1:
+            return nullcontext()
+        # ProcessPoolExecutor raises BrokenProcessPool if a worker dies (e.g. OOM-killed),
+        # where a multiprocessing.Pool result would wait forever
+        return ProcessPoolExecutor(max_workers=self.workers,
+                                   initializer=_init_worker,
+                                   initargs=(self.custom_keywords_file,))
+
+    def _scan_in_pool(self, pool: ProcessPoolExecutor, emails: Iterator[str]) -> Iterator[SensitiveMatch]:
+        """Scan emails in the pool with a bounded sliding window of in-flight batches, yielding matches in order."""
+        pending: Deque[Future] = deque()
+        max_pending = self.workers * 4
+        while True:
+            batch = list(islice(emails, 64))
+            if batch:
+                pending.append(pool.submit(_scan_emails_worker, batch))
+            if not pending:
+                return
+            # Once the window is full (or the mbox is exhausted) wait on the oldest batch;
+            # the other queued batches keep every worker busy meanwhile.
+            if len(pending) >= max_pending or not batch:
+                yield from pending.popleft().result()
+
+    def process_mbox_file(self, mbox_file: Path, pool: Optional[ProcessPoolExecutor] = None) -> None:
+        """Process an mbox file and scan each email, reusing the given worker pool if any."""
+        if pool is None and self.workers > 1:
+            with self._create_pool() as pool:
+                return self.process_mbox_file(mbox_file, pool)
 
-    def process_mbox_file(self, mbox_file: Path) -> None:
-        """Process an mbox file and scan each email."""
         try:
-            with open(mbox_file, 'r', encoding='utf-8', errors='ignore') as f:
-                email_text = ""
-                for line in f:
-                    if line.startswith("From "):
-                        if email_text:
-                            match = self.scan_email(email_text)
-                            if match:
-                                self.matches.append(match)
-                            email_text = ""
-                    email_text += line
-
-                # Process the last email
-                if email_text:
-                    match = self.scan_email(email_text)
-                    if match:
-                        self.matches.append(match)
+            emails = self.iter_emails(mbox_file)
+            if pool is not None:
+                results = self._scan_in_pool(pool, emails)
+            else:
+                results = map(self.scan_email, emails)
+            for match in results:
+                if match:
+                    self.write_match(match)
         except Exception as e:
             logging.error(f"Error processing mbox file {mbox_file}: {e}")
             raise
 
-    def save_matches(self) -> None:
-        """Save detected matches to a JSON file."""
-        output_file = self.output_dir / "sensitive_matches.json"
-        try:
-            # Ensure the output directory exists
+    def _open_matches_file(self) -> BinaryIO:
+        """Open the JSONL match file, truncating any previous run's output the first time."""
+        if self._out is None:
             self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._out = open(self.matches_file, 'ab' if self._matches_file_started else 'wb')
+            self._matches_file_started = True
+        return self._out
+
+    def _close_matches_file(self) -> None:
+        """Close the JSONL match file if it is open."""
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def write_match(self, match: SensitiveMatch) -> None:
+        """Append a detected match to the JSONL output file."""
+        self._open_matches_file().write(_json_dumps(asdict(match)) + b"\n")
+        self.match_count += 1
+        for category in match.matched_keywords:
+            self.category_counts[category] = self.category_counts.get(category, 0) + 1
 
-            # Convert set to list for JSON serialization
-            matches_json = []
-            for match in self.matches:
-                match_dict = match.__dict__.copy()
-                match_dict['matched_keywords'] = list(match_dict['matched_keywords'])
-                matches_json.append(match_dict)
-
-            with open(output_file, 'w') as f:
-                json.dump(matches_json, f, indent=4)
-            logging.info(f"Sensitive information matches saved to {output_file}")
+    def save_matches(self) -> None:
+        """Close the JSONL match file and save a summary of the detected matches."""
+        output_file = self.output_dir / "sensitive_matches_summary.json"
+        try:
+            # Opening also creates the output directory and an empty file when nothing matched
+            self._open_matches_file()
+            self._close_matches_file()
+
+            summary = {
+                "matches_file": str(self.matches_file),
+                "total_matches": self.match_count,
+                "category_counts": self.category_counts
+            }
+            output_file.write_bytes(_json_dumps(summary, indent=True))
+            logging.info(f"Found {self.match_count} emails with sensitive information; summary saved to {output_file}")
         except Exception as e:
             logging.error(f"Error saving matches: {e}")
             raise
@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import domainhunter
+from domainhunter import KeywordManager
+
+
+class CustomKeywordsTest(unittest.TestCase):
+    def load(self, custom_categories):
+        with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as f:
+            json.dump(custom_categories, f)
+        self.addCleanup(os.unlink, f.name)
+        return KeywordManager(f.name)
+
+    def test_blank_and_duplicate_keywords_are_dropped(self):
+        keyword_manager = self.load({
+            "authentication": ["", "  ", "password", " hunter2 ", "hunter2"],
+            "custom": ["", "  ", "widget", "widget"]
+        })
+
+        self.assertEqual(keyword_manager.keyword_categories["authentication"].count("password"), 1)
+        self.assertEqual(keyword_manager.keyword_categories["authentication"][-1], "hunter2")
+        self.assertEqual(keyword_manager.keyword_categories["custom"], ["widget"])
+        self.assertEqual(keyword_manager.find_matches("nothing to see here"), (set(), []))
+        self.assertEqual(keyword_manager.find_matches("a widget")[0], {"custom"})
+
+
+@unittest.skipUnless(domainhunter.RE2_AVAILABLE, "google-re2 is not installed")
+class RE2PrefilterTest(unittest.TestCase):
+    def setUp(self):
+        self.keyword_manager = KeywordManager()
+        self.assertIsNotNone(self.keyword_manager.category_set)
+        self.re_manager = KeywordManager()
+        self.re_manager.category_set = None
+
+    def assertMatchesRePath(self, text):
+        self.assertEqual(self.keyword_manager.find_matches(text), self.re_manager.find_matches(text))
+
+    def test_email_without_keywords(self):
+        self.assertEqual(self.keyword_manager.find_matches("nothing here"), (set(), []))
+
+    def test_matches_re_path(self):
+        text = "Send the root password and the API key, plus my SSN and salary."
+        self.assertMatchesRePath(text)
+        self.assertIn("infrastructure", self.keyword_manager.find_matches(text)[0])
+
+    def test_unicode_separators(self):
+        for separator in ("\xa0", "　", "\x0b", "\x85"):
+            with self.subTest(separator=repr(separator)):
+                text = f"send the api{separator}key and the root{separator}password"
+                self.assertMatchesRePath(text)
+                self.assertEqual(self.keyword_manager.find_matches(text)[0],
+                                 {"authentication", "infrastructure"})
+
+    def test_unicode_word_boundaries(self):
+        for text in ("épassword", "passwordé", "ééapi keyéé", "　ssn　"):
+            with self.subTest(text=text):
+                self.assertMatchesRePath(text)
+
+    def test_to_re2_syntax(self):
+        self.assertEqual(domainhunter._to_re2_syntax(r"api[_\s]?key"),
+                         r"api[_\s\x0b\x1c-\x1f\x85\p{Z}]?key")
+        self.assertEqual(domainhunter._to_re2_syntax(r"pin\d{4}"), r"pin[\p{Nd}]{4}")
+        self.assertEqual(domainhunter._to_re2_syntax(r"[]\w]x\.y"), r"[]\w\p{L}\p{N}]x\.y")
+
+
+class WordBoundaryTest(unittest.TestCase):
+    def test_is_word_boundary(self):
+        text = "x_password passwords draft-v2"
+        self.assertTrue(domainhunter._is_word_boundary(text, 0))
+        self.assertFalse(domainhunter._is_word_boundary(text, 2))
+        self.assertTrue(domainhunter._is_word_boundary(text, 10))
+        self.assertFalse(domainhunter._is_word_boundary(text, 19))
+        self.assertTrue(domainhunter._is_word_boundary(text, 26))
+        self.assertTrue(domainhunter._is_word_boundary(text, len(text)))
+        self.assertFalse(domainhunter._is_word_boundary("", 0))
+        self.assertFalse(domainhunter._is_word_boundary("épassword", 1))
+
+
+@unittest.skipUnless(domainhunter.AHOCORASICK_AVAILABLE, "pyahocorasick is not installed")
+class AhoCorasickTest(unittest.TestCase):
+    def setUp(self):
+        self.keyword_manager = KeywordManager()
+        self.assertIsNotNone(self.keyword_manager.literal_automaton)
+        with mock.patch.object(domainhunter, "AHOCORASICK_AVAILABLE", False):
+            self.re_manager = KeywordManager()
+
+    def test_literal_automaton_routes_literals(self):
+        automaton = self.keyword_manager.literal_automaton
+        self.assertEqual(automaton.get("password"), ("password", ["authentication"]))
+        self.assertNotIn("api[_\\s]?key", automaton)
+        self.assertIn("api[_\\s]?key", self.keyword_manager.pattern_keywords["authentication"])
+
+    def test_boundaries_match_re_path(self):
+        for text in ("x_password", "passwords", "draft-v2", "PASSWORD!", "épassword", "password_",
+                     "the NDA draft", "İpassword", "İ password", "ssn.ssn"):
+            with self.subTest(text=text):
+                self.assertEqual(self.keyword_manager.find_matches(text), self.re_manager.find_matches(text))
+
+    def test_context_keeps_original_text(self):
+        matched, context_parts = self.keyword_manager.find_matches("Send the PASSWORD under NDA")
+        self.assertEqual(matched, {"authentication", "business_confidential"})
+        self.assertEqual(context_parts, ["PASSWORD", "NDA"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import domainhunter
+from domainhunter import PSTScanner
+
+
+def _exit_worker(emails):
+    """Stand-in for a worker process that gets killed mid-task."""
+    os._exit(1)
+
+
+class IterEmailsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.scanner = PSTScanner(output_dir=os.path.join(self.tmp.name, "out"),
+                                  log_file=os.path.join(self.tmp.name, "scan.log"),
+                                  workers=1)
+
+    def test_crlf_mbox(self):
+        mbox_file = Path(self.tmp.name) / "crlf.mbox"
+        mbox_file.write_bytes(b"From a\r\nMessage-ID: <x>\r\n\r\nbody password\r\n"
+                              b"From b\r\nSubject: hi\r\n\r\nnothing\r\n")
+
+        emails = list(self.scanner.iter_emails(mbox_file))
+
+        self.assertEqual(len(emails), 2)
+        self.assertEqual(self.scanner.extract_email_content(emails[0]), ("x", None, "body password", None))
+        self.assertEqual(self.scanner.scan_email(emails[0]).matched_keywords, {"authentication"})
+
+
+class SaveMatchesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output_dir = os.path.join(self.tmp.name, "out")
+        self.mbox_file = Path(self.tmp.name) / "test.mbox"
+
+    def scan(self, mbox_text, workers=1):
+        self.mbox_file.write_text(mbox_text)
+        scanner = PSTScanner(output_dir=self.output_dir,
+                             log_file=os.path.join(self.tmp.name, "scan.log"),
+                             workers=workers)
+        scanner.process_mbox_file(self.mbox_file)
+        scanner.save_matches()
+        return scanner
+
+    def test_rerun_without_matches_truncates_previous_output(self):
+        self.scan("From a\nSubject: your password\n\nbody\n")
+        self.assertEqual(len(self.scan_output()), 1)
+
+        scanner = self.scan("From a\nSubject: lunch\n\nnothing here\n")
+
+        self.assertEqual(scanner.match_count, 0)
+        self.assertEqual(self.scan_output(), [])
+
+    def test_worker_pool_matches_in_process_scan(self):
+        mbox_text = "".join(
+            f"From {i}\nMessage-ID: <{i}>\nSubject: {'password' if i % 3 else 'lunch'}\n\nbody\n"
+            for i in range(1000)
+        )
+        self.scan(mbox_text)
+        expected = self.scan_output()
+
+        scanner = self.scan(mbox_text, workers=2)
+
+        self.assertEqual(scanner.match_count, 666)
+        self.assertEqual(self.scan_output(), expected)
+
+    def test_failed_scan_flushes_matches_found_so_far(self):
+        pst_file = Path(self.tmp.name) / "test.pst"
+        pst_file.write_bytes(b"")
+        mbox_dir = Path(self.output_dir) / "mbox"
+        mbox_dir.mkdir(parents=True)
+        (mbox_dir / "Inbox.mbox").write_text("From a\nSubject: your password\n\nbody\n"
+                                             "From b\nSubject: lunch\n\nbody\n")
+        scanner = PSTScanner(output_dir=self.output_dir,
+                             log_file=os.path.join(self.tmp.name, "scan.log"),
+                             workers=1)
+        first_match = scanner.scan_email("From a\nSubject: your password\n\nbody\n")
+
+        with mock.patch("subprocess.run"), \
+                mock.patch.object(scanner, "verify_pst_file", return_value=True), \
+                mock.patch.object(scanner, "scan_email", side_effect=[first_match, RuntimeError("scan failed")]):
+            with self.assertRaises(RuntimeError):
+                scanner.scan_pst_file(str(pst_file))
+
+        self.assertIsNone(scanner._out)
+        self.assertEqual(len(self.scan_output()), 1)
+
+    def test_dead_worker_fails_instead_of_hanging(self):
+        with mock.patch.object(domainhunter, "_scan_emails_worker", _exit_worker):
+            with self.assertRaises(BrokenProcessPool):
+                self.scan("From a\nSubject: your password\n\nbody\n", workers=2)
+
+    def scan_output(self):
+        return (Path(self.output_dir) / "sensitive_matches.jsonl").read_text().splitlines()
+
+
+if __name__ == "__main__":
+    unittest.main()